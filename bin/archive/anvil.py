@@ -3,21 +3,48 @@
 # This script is a command-line utility for interacting with Ethereum smart contracts with an emphasis on Minter contracts
 
 import argparse
+import concurrent.futures
+import decimal
+import functools
 import json
 import logging
 import os
+import pathlib
+import re
 import signal
+import socket
 import subprocess
 import sys
 import threading
 import time
 
-from dotenv import load_dotenv
+from dotenv import dotenv_values, load_dotenv
 
 load_dotenv()  # Load .env file once
 
 deploy_log = "./log/deploy-local.log"
 abi_dir = "./out"
+# how cast reports a call the node answered with a JSON-RPC error, as opposed to one that failed to reach it
+rpc_error_response = "server returned an error response"
+# Multicall3 is deployed at the same address on every chain that has it
+multicall3 = "0xcA11bde05977b3631167028862bE2a173976CA11"
+# calls per aggregate3, keeping each cast argument well under the command line's per-argument limit
+multicall_batch = 200
+# aggregate3 calls in flight at once
+multicall_workers = 8
+
+zero_address = "0x" + "0" * 40
+# keccak of Transfer(address,address,uint256), the topic every ERC20 transfer is logged under
+transfer_topic = "0xddf252ad1be2c89b69c2b068fc378daa952ba7f163c4a11628f55a4df523b3ef"
+
+# a revert reported by cast: the error selector, then any ABI-encoded error data
+CUSTOM_ERROR_RE = re.compile(r'custom error ([^,\s]+)(?:, data: "([^"]+)")?')
+# an ABI type encoded in a single word
+STATIC_TYPE_RE = re.compile(r"(uint|int|bytes)([0-9]+)|address|bool")
+# one (success, returnData) tuple of cast's decoded aggregate3 output
+MULTICALL_RESULT_RE = re.compile(r"\((true|false), (0x[0-9a-fA-F]*)\)")
+# 0x-prefixed hex data, whole bytes when the digits come in pairs
+HEX_RE = re.compile(r"0x[0-9a-fA-F]*")
 
 # Configure logging
 logger = logging.getLogger("anvil")
@@ -25,6 +52,12 @@ console_handler = logging.StreamHandler()
 formatter = logging.Formatter("%(levelname)s: %(message)s")
 console_handler.setFormatter(formatter)
 logger.addHandler(console_handler)
+# The format above uses neither the caller's source location nor thread/process details, so
+# don't collect them for every record (finding the caller walks the stack)
+logging._srcfile = None
+logging.logThreads = False
+logging.logProcesses = False
+logging.logMultiprocessing = False
 
 # Map verbosity levels to logging levels:
 # -v    -> INFO     (20)
@@ -76,29 +109,38 @@ def quiet_run_command(command):
     """
     Run command and return result without checking exit code
     """
-    cmd_str = " ".join(command)
-    logger.debug(f"Running command: {cmd_str}")
+    # Logging is formatted lazily, and only at levels that are enabled: at the default WARNING
+    # level a command is run without building any of these strings
+    cmd_str = " ".join(command) if logger.isEnabledFor(logging.INFO) else ""
+    logger.debug("Running command: %s", cmd_str)
 
     # Only print command at INFO level and above if we're executing cast/anvil operations
     if command[0] in ["cast", "anvil"]:
-        logger.info(f">>> {cmd_str}")
+        logger.info(">>> %s", cmd_str)
 
-    result = subprocess.run(command, capture_output=True, text=True)
+    # Capture bytes and decode them as UTF-8, which is what cast writes, rather than through the
+    # locale's codec and newline translation of text mode
+    result = subprocess.run(command, capture_output=True)
+    result.stdout = result.stdout.decode("utf-8", errors="replace")
+    result.stderr = result.stderr.decode("utf-8", errors="replace")
 
     # Log stdout/stderr at different levels based on verbosity
-    if result.stdout:
-        logger.trace(f"Command stdout: {result.stdout.strip()}")
+    if result.stdout and logger.isEnabledFor(logging.TRACE):
+        logger.trace("Command stdout: %s", result.stdout.strip())
         # At TRACE_DETAIL level, we add details about environment and command execution
         logger.trace_detail(
-            f"Full command details:\n  Command: {cmd_str}\n  Exit code: {result.returncode}\n  Full stdout: \n{result.stdout}"
+            "Full command details:\n  Command: %s\n  Exit code: %s\n  Full stdout: \n%s",
+            cmd_str,
+            result.returncode,
+            result.stdout,
         )
 
-    if result.stderr:
+    if result.stderr and logger.isEnabledFor(logging.TRACE):
         # Always show stderr at regular TRACE level
-        logger.trace(f"Command stderr: {result.stderr.strip()}")
+        logger.trace("Command stderr: %s", result.stderr.strip())
 
     # Log return code at DEBUG level
-    logger.debug(f"Command returned: {result.returncode}")
+    logger.debug("Command returned: %s", result.returncode)
 
     return result
 
@@ -136,119 +178,182 @@ def decode_custom_error(error_data, contract_name=None, sig_input=None):
         return f"Error: {result.stdout.strip()}", error_data
 
     # Look for error definitions in contract ABIs
-    contract_names = []
+    if len(error_id) == 10 and HEX_RE.fullmatch(error_id):  # Valid selector
+        selector = int(error_id, 16)
+        # First search in the specific contract's ABI
+        contract_paths = abi_index().get(contract_name, []) if contract_name else []
+        found = find_error(contract_paths, selector)
+        if found is None:
+            # Then search all contract ABIs
+            logger.debug("Searching all contract ABIs for the error selector")
+            found = find_error(
+                (path for paths in abi_index().values() for path in paths if path not in contract_paths),
+                selector,
+            )
+        if found:
+            return describe_error(*found, error_data)
 
-    # First, try the specifically mentioned contract
-    if contract_name:
-        contract_names.append(contract_name)
+    # If all attempts fail, return the original error data
+    return f"Custom error: {error_id}", error_data
 
-    # If we have a target contract address, find all ABIs and check them
-    if len(error_id) == 10:  # Valid selector
-        # First search in the specific contract's ABI
-        if contract_name:
-            # Find the contract ABI file
-            find_result = quiet_run_command(["find", abi_dir, "-name", f"{contract_name}.json", "-print", "-quit"])
 
-            if find_result.returncode == 0 and find_result.stdout.strip():
-                found_error = search_abi_for_error(find_result.stdout.strip(), error_id, error_data)
-                if found_error:
-                    return found_error
+@functools.cache
+def load_abi(abi_path):
+    """
+    Load the ABI entries of a compiled contract file, parsing each file at most once per run
+    """
+    # json takes the bytes as they are, with no text decoding layer in between
+    data = json.loads(pathlib.Path(abi_path).read_bytes())
+    return data.get("abi", []) if isinstance(data, dict) else []
 
-        # Then search all contract ABIs
-        logger.debug("Searching all contract ABIs for the error selector")
-        find_all_result = quiet_run_command(["find", abi_dir, "-name", "*.json", "-type", "f"])
 
-        if find_all_result.returncode == 0 and find_all_result.stdout.strip():
-            for abi_path in find_all_result.stdout.strip().split("\n"):
-                # Skip already checked contract
-                if contract_name and abi_path.endswith(f"/{contract_name}.json"):
-                    continue
+@functools.cache
+def selector_of(sig):
+    """
+    Calculate the selector (first 4 bytes of the keccak hash) of a function or error signature
 
-                found_error = search_abi_for_error(abi_path, error_id, error_data)
-                if found_error:
-                    return found_error
+    Returns:
+        int or None: the selector, or None if cast could not hash the signature
+    """
+    result = quiet_run_command(["cast", "keccak", sig])
+    if result.returncode != 0:
+        return None
+    # Get just the first 10 characters (0x + 8 for 4 bytes)
+    return int(result.stdout.strip()[:10], 16)
 
-    # If all attempts fail, return the original error data
-    return f"Custom error: {error_id}", error_data
+
+def error_signature(error):
+    """
+    The canonical signature of an ABI error entry, e.g. 'Unauthorized(address)'
+    """
+    param_types = [input_param.get("type", "") for input_param in error.get("inputs", [])]
+    return f"{error.get('name', '')}({','.join(param_types)})"
+
+
+@functools.cache
+def abi_index():
+    """
+    Index the ABI files under abi_dir by file name, e.g. 'ERC20' for .../ERC20.sol/ERC20.json
+
+    Returns:
+        dict: file name (without .json) -> list of ABI file paths with that name, in path order
+    """
+    index = {}
+    if os.path.isdir(abi_dir):
+        for path in sorted(pathlib.Path(abi_dir).rglob("*.json")):
+            # build-info holds whole compiler outputs, not contract ABIs
+            if "build-info" not in path.parts:
+                index.setdefault(path.stem, []).append(str(path))
+    return index
+
+
+def find_error(abi_paths, selector):
+    """
+    Find the custom error with the given selector in the ABI files, stopping at the first match
+
+    Each error's selector is hashed only when it is reached, so a match found early (as it usually
+    is, in the contract that reverted) costs a few hashes rather than one for every error defined.
+
+    Returns:
+        tuple or None: (contract_name, error ABI entry), or None if no file defines the error
+    """
+    for abi_path in abi_paths:
+        logger.debug(f"Checking ABI file: {abi_path}")
+        try:
+            abi = load_abi(abi_path)
+        except (OSError, ValueError) as e:
+            logger.debug(f"Could not read ABI file {abi_path}: {e}")
+            continue
+        for entry in abi:
+            if entry.get("type") == "error" and entry.get("name") and selector_of(error_signature(entry)) == selector:
+                return os.path.basename(abi_path).split(".")[0], entry
+    return None
 
 
-def search_abi_for_error(abi_path, error_id, error_data):
+def decode_static_params(param_types, data):
     """
-    Search an ABI file for an error definition matching the given selector
+    Decode ABI-encoded parameters of static types (uintN, intN, address, bool and bytesN)
 
     Args:
-        abi_path: Path to the ABI JSON file
-        error_id: Error selector (0x + 8 hex digits)
+        param_types: The parameters' ABI types
+        data: The encoded parameters, as hex digits (without a selector)
+
+    Returns:
+        list or None: the values as strings, or None if a type isn't static or the data is too short
+    """
+    try:
+        words = bytes.fromhex(data.removeprefix("0x"))
+    except ValueError:
+        return None
+    values = []
+    for i, param_type in enumerate(param_types):
+        match = STATIC_TYPE_RE.fullmatch(param_type)
+        word = words[i * 32 : (i + 1) * 32]
+        if not match or len(word) < 32:
+            return None
+        if match.group(1) == "uint":
+            values.append(str(int.from_bytes(word, "big")))
+        elif match.group(1) == "int":
+            values.append(str(int.from_bytes(word, "big", signed=True)))
+        elif match.group(1) == "bytes":
+            values.append("0x" + word[: int(match.group(2))].hex())
+        elif param_type == "address":
+            values.append("0x" + word[12:].hex())
+        else:  # bool
+            values.append("true" if any(word) else "false")
+    return values
+
+
+def describe_error(contract_name, error, error_data):
+    """
+    Describe a custom error found in a contract ABI
+
+    Args:
+        contract_name: Name of the contract defining the error
+        error: The error's ABI entry
         error_data: Full error data for parameter decoding
 
     Returns:
-        tuple or None: (decoded_error, raw_data) if found, None otherwise
+        tuple: (decoded_error, raw_data)
     """
-    logger.debug(f"Checking ABI file: {abi_path}")
+    name = error["name"]
+    inputs = error.get("inputs", [])
+    sig = error_signature(error)
+    logger.debug(f"Found matching error in {contract_name}: {sig}")
 
-    # Extract the contract name from the path for better error messages
-    contract_name = os.path.basename(abi_path).split(".")[0]
+    # Try to decode the full error data with parameters
+    decoded_params = ""
 
-    # Extract errors using type filter
-    error_result = quiet_run_command(["jq", "-c", '.abi[] | select(.type == "error")', abi_path])
+    if len(error_data) > 10 and inputs:  # Contains parameters
+        # Static parameters are decoded here; anything else is left to cast
+        decoded_values = decode_static_params([param.get("type", "") for param in inputs], error_data[10:])
+        if decoded_values is None:
+            calldata_result = quiet_run_command(["cast", "decode-calldata", sig, error_data])
+            if calldata_result.returncode == 0 and calldata_result.stdout.strip():
+                decoded_values = calldata_result.stdout.strip().split("\n")
 
-    if error_result.returncode == 0 and error_result.stdout.strip():
-        logger.debug(f"Found errors in {contract_name}")
+        if decoded_values:
+            # Format parameter names if available
+            param_info = []
 
-        # Process each error definition
-        for error_json in error_result.stdout.strip().split("\n"):
-            try:
-                error = json.loads(error_json)
-                name = error.get("name", "")
-                inputs = error.get("inputs", [])
-
-                if name:
-                    # Create the error signature for calldata decoding
-                    param_types = [input_param.get("type", "") for input_param in inputs]
-                    sig = f"{name}({','.join(param_types)})"
-
-                    # Calculate the selector to check for a match
-                    selector_result = quiet_run_command(["cast", "keccak", sig])
-                    if selector_result.returncode == 0:
-                        # Get just the first 10 characters (0x + 8 for 4 bytes)
-                        selector = selector_result.stdout.strip()[:10]
-                        logger.debug(f"Error {name} has selector {selector}")
-
-                        if selector == error_id:
-                            logger.debug(f"Found matching error in {contract_name}: {sig}")
-
-                            # Try to decode the full error data with parameters
-                            decoded_params = ""
-
-                            if len(error_data) > 10 and inputs:  # Contains parameters
-                                calldata_result = quiet_run_command(["cast", "calldata", sig, error_data])
-                                if calldata_result.returncode == 0 and calldata_result.stdout.strip():
-                                    # Format parameter names if available
-                                    param_info = []
-                                    decoded_values = calldata_result.stdout.strip().split("\n")
-
-                                    for i, param in enumerate(inputs):
-                                        if i < len(decoded_values):
-                                            param_name = param.get("name", f"param{i}")
-                                            param_value = decoded_values[i].strip()
-                                            param_info.append(f"{param_name}={param_value}")
-
-                                    decoded_params = ", ".join(param_info)
-
-                            # Build full error description
-                            error_description = f"Error: {name}"
-                            if decoded_params:
-                                error_description += f"({decoded_params})"
-
-                            # Include the contract name for context
-                            error_description += f" [from {contract_name}]"
-
-                            # Return both the decoded error and the raw data
-                            return error_description, error_data
-            except Exception as e:
-                logger.debug(f"Error processing error definition: {e}")
+            for i, param in enumerate(inputs):
+                if i < len(decoded_values):
+                    param_name = param.get("name", f"param{i}")
+                    param_value = decoded_values[i].strip()
+                    param_info.append(f"{param_name}={param_value}")
 
-    return None
+            decoded_params = ", ".join(param_info)
+
+    # Build full error description
+    error_description = f"Error: {name}"
+    if decoded_params:
+        error_description += f"({decoded_params})"
+
+    # Include the contract name for context
+    error_description += f" [from {contract_name}]"
+
+    # Return both the decoded error and the raw data
+    return error_description, error_data
 
 
 def run_command(command):
@@ -273,13 +378,8 @@ def run_command(command):
         if result.stderr:
             error_msg = result.stderr.strip()
 
-            # Look for custom error pattern in the error message
-            custom_error_match = None
-            if "custom error" in error_msg:
-                import re
-
-                # Extract the custom error data
-                custom_error_match = re.search(r'custom error ([^,\s]+)(?:, data: "([^"]+)")?', error_msg)
+            # Look for custom error pattern in the error message, extracting the custom error data
+            custom_error_match = CUSTOM_ERROR_RE.search(error_msg)
 
             if custom_error_match:
                 error_selector = custom_error_match.group(1)
@@ -303,6 +403,39 @@ def run_command(command):
     return result
 
 
+def quiet_rpc(method, *params):
+    """
+    Make a JSON-RPC call to the node through cast and return the response without checking for an error
+
+    A call the node answers with an error is returned as {"error": {"message": ...}}; a call that
+    does not reach the node raises subprocess.CalledProcessError.
+    """
+    # --raw takes the params as one JSON array, so objects and strings are passed through as they are
+    command = ["cast", "rpc", "--raw", method, json.dumps(list(params))]
+    result = quiet_run_command(command)
+    if result.returncode == 0:
+        response = {"result": json.loads(result.stdout)}
+    elif rpc_error_response in result.stderr:
+        response = {"error": {"message": result.stderr.strip()}}
+    else:
+        raise subprocess.CalledProcessError(result.returncode, command, result.stdout, result.stderr)
+
+    logger.trace("RPC response: %s", response)
+    return response
+
+
+def rpc(method, *params):
+    """
+    Make a JSON-RPC call to the node and exit if it fails, otherwise return its result
+    """
+    response = quiet_rpc(method, *params)
+    if "error" in response:
+        print(f"*** RPC call failed: {method} {' '.join(json.dumps(param) for param in params)}")
+        print(f"*** Error: {response['error'].get('message', response['error'])}")
+        sys.exit(1)
+    return response.get("result")
+
+
 def with_impersonation(network, identity, callback_func, *callback_args, **callback_kwargs):
     """
     Execute a function with optional impersonation
@@ -316,18 +449,19 @@ def with_impersonation(network, identity, callback_func, *callback_args, **callb
     if identity:
         # Set up impersonation
         impersonation_address = address_of(network, identity)
-        run_command(["cast", "rpc", "anvil_impersonateAccount", impersonation_address])
+        rpc("anvil_impersonateAccount", impersonation_address)
         try:
             # Execute the callback with the impersonation address
             return callback_func(impersonation_address, *callback_args, **callback_kwargs)
         finally:
             # Clean up impersonation
-            run_command(["cast", "rpc", "anvil_stopImpersonatingAccount", impersonation_address])
+            rpc("anvil_stopImpersonatingAccount", impersonation_address)
     else:
         # No impersonation needed, just run the function without an impersonation address
         return callback_func(None, *callback_args, **callback_kwargs)
 
 
+@functools.cache
 def bcinfo(network, name, field="address"):
     # Use quiet version since bcinfo might legitimately fail
     result = quiet_run_command(["lib/bao-base/run", "-q", "bcinfo", network, name, field])
@@ -340,23 +474,52 @@ def address_of(network, wallet):
     elif wallet == "me":
         pk = os.getenv("PRIVATE_KEY")
         if pk:
-            # Wallet address conversion shouldn't fail
-            result = run_command(["cast", "wallet", "address", "--private-key", pk])
-            return result.stdout.strip()
+            return private_key_address(pk)
         else:
             print("error: no private key found in env")
             sys.exit(1)
     else:
-        address = bcinfo(network, wallet)
-        if not address and os.path.isfile(deploy_log):
-            with open(deploy_log) as f:
-                data = json.load(f)
-                address = data.get("addresses", {}).get(wallet, "")
-        if not address:
-            address = wallet
-        return address
+        return named_address_of(network, wallet)
+
+
+@functools.cache
+def private_key_address(pk):
+    # Wallet address conversion shouldn't fail
+    result = run_command(["cast", "wallet", "address", "--private-key", pk])
+    return result.stdout.strip()
 
 
+def address_of_many(network, wallets):
+    """
+    Resolve several wallets, as address_of does for each
+
+    The bcinfo lookups behind distinct names are independent processes, so they run side by side
+    rather than one after another.
+    """
+    names = {wallet for wallet in wallets if not wallet.startswith("0x") and wallet != "me"}
+    if len(names) > 1:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=len(names)) as executor:
+            # named_address_of caches each answer for the address_of calls below
+            list(executor.map(lambda name: named_address_of(network, name), names))
+    return [address_of(network, wallet) for wallet in wallets]
+
+
+@functools.cache
+def named_address_of(network, name):
+    """
+    Look up a named address in bcinfo or, failing that, the local deploy log
+    """
+    address = bcinfo(network, name)
+    if not address and os.path.isfile(deploy_log):
+        with open(deploy_log) as f:
+            data = json.load(f)
+            address = data.get("addresses", {}).get(name, "")
+    if not address:
+        address = name
+    return address
+
+
+@functools.cache
 def role_number_of(network, role, on):
     if role.startswith("0x") or role.isdigit():
         return role
@@ -368,6 +531,7 @@ def role_number_of(network, role, on):
     return output[0]
 
 
+@functools.cache
 def get_function_info(contract, func_name):
     """
     Get comprehensive information about a function from its ABI
@@ -385,49 +549,54 @@ def get_function_info(contract, func_name):
             'abi_path': Path to the contract ABI file
     """
     # Find the contract ABI file
-    result = run_command(["find", abi_dir, "-name", f"{contract}.json", "-print", "-quit"])
-    abi_path = result.stdout.strip()
-    if not abi_path:
+    abi_paths = abi_index().get(contract)
+    if not abi_paths:
         print(f"error: Contract ABI file not found for {contract}")
         sys.exit(1)
+    abi_path = abi_paths[0]
 
-    # Get detailed function information including inputs and outputs
-    result = run_command(["jq", f'.abi[] | select(.name == "{func_name}" and .type == "function")', abi_path])
+    try:
+        abi = load_abi(abi_path)
+    except (OSError, ValueError):
+        print(f"error: Invalid JSON in ABI for {contract}.{func_name}")
+        sys.exit(1)
 
-    if result.returncode != 0 or not result.stdout.strip():
+    # Get detailed function information including inputs and outputs
+    func_data = next(
+        (entry for entry in abi if entry.get("type") == "function" and entry.get("name") == func_name), None
+    )
+    if func_data is None:
         print(f"error: Function {func_name} not found in contract {contract}")
         sys.exit(1)
 
-    try:
-        func_data = json.loads(result.stdout.strip())
-
-        # Extract parameter types for the signature
-        param_types = [input_param.get("type", "") for input_param in func_data.get("inputs", [])]
-        param_str = ",".join(param_types)
-
-        return {
-            "signature": f"{func_name}({param_str})",
-            "param_types": param_types,
-            "inputs": func_data.get("inputs", []),
-            "outputs": func_data.get("outputs", []),
-            "abi_path": abi_path,
-        }
-    except json.JSONDecodeError:
-        print(f"error: Invalid JSON in ABI for {contract}.{func_name}")
-        sys.exit(1)
+    # Extract parameter types for the signature
+    param_types = [input_param.get("type", "") for input_param in func_data.get("inputs", [])]
+    param_str = ",".join(param_types)
+
+    return {
+        "signature": f"{func_name}({param_str})",
+        "param_types": param_types,
+        "inputs": func_data.get("inputs", []),
+        "outputs": func_data.get("outputs", []),
+        "abi_path": abi_path,
+    }
+
+
+@functools.cache
+def dotenv_file():
+    """
+    The variables set in .env, parsed once per run
+    """
+    return dotenv_values(".env") if os.path.isfile(".env") else {}
 
 
 def lookup_env(env_name):
-    value = os.getenv(env_name, "")
-    if not value and os.path.isfile(".env"):
-        with open(".env") as f:
-            for line in f:
-                if line.startswith(env_name + "="):
-                    value = line.strip().split("=", 1)[1]
-                    break
-    return value
+    # load_dotenv doesn't override variables already in the environment, even empty ones,
+    # so fall back to the .env value for those
+    return os.getenv(env_name) or dotenv_file().get(env_name) or ""
 
 
+@functools.cache
 def parse_sig(network, sig_input):
     """
     Parse a signature input which can be either:
@@ -454,17 +623,153 @@ def parse_sig(network, sig_input):
         sys.exit(1)
 
 
+WEI_PER_ETH = 10**18
+
+
+def to_wei(eth_amount):
+    """
+    Convert an amount of ether (e.g. '1.5') to wei, as 'cast to-wei' does
+    """
+    try:
+        # enough precision for any uint256, so the scaling never rounds
+        with decimal.localcontext() as context:
+            context.prec = 80
+            wei = decimal.Decimal(eth_amount) * WEI_PER_ETH
+    except decimal.InvalidOperation:
+        wei = None
+    if wei is None or not wei.is_finite() or wei != wei.to_integral_value():
+        print(f"*** Error: invalid amount '{eth_amount}'")
+        sys.exit(1)
+    return int(wei)
+
+
+def from_wei(wei_amount):
+    """
+    Convert an amount of wei to ether with all 18 decimals, as 'cast from-wei' does
+    """
+    eth, wei = divmod(abs(int(wei_amount)), WEI_PER_ETH)
+    sign = "-" if int(wei_amount) < 0 else ""
+    return f"{sign}{eth}.{wei:018d}"
+
+
+def to_hex(value):
+    """
+    Convert an integer to a 0x-prefixed hex string, as 'cast to-hex' does
+    """
+    return hex(int(value))
+
+
 def grab(network, wallet, eth_amount):
     address = address_of(network, wallet)
-    wei_amount = run_command(["cast", "to-wei", eth_amount]).stdout.strip()
-    run_command(
-        ["cast", "rpc", "anvil_setBalance", address, run_command(["cast", "to-hex", wei_amount]).stdout.strip()]
-    )
-    wei_balance = run_command(["cast", "balance", address]).stdout.strip()
-    eth_balance = run_command(["cast", "from-wei", wei_balance]).stdout.strip()
+    wei_amount = to_wei(eth_amount)
+    rpc("anvil_setBalance", address, to_hex(wei_amount))
+    wei_balance = int(rpc("eth_getBalance", address, "latest"), 16)
+    eth_balance = from_wei(wei_balance)
     print(f"*** {wallet} balance is now {eth_balance}")
 
 
+def balance_of_calldata(address):
+    """
+    Encode a balanceOf(address) call
+    """
+    return "0x70a08231" + address[2:].lower().rjust(64, "0")
+
+
+def balance_of(token_address, address):
+    """
+    Get the token balance of an address, or None if it could not be read
+    """
+    response = quiet_rpc("eth_call", {"to": token_address, "data": balance_of_calldata(address)}, "latest")
+    try:
+        return int(response["result"], 16)
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def balances_of(token_address, addresses):
+    """
+    Get the token balances of many addresses, batching the balanceOf calls through Multicall3
+
+    Falls back to one call per address if Multicall3 can't be used on the chain.
+
+    Returns:
+        dict: address -> balance in wei, for each address whose balance could be read
+    """
+    batches = [addresses[i : i + multicall_batch] for i in range(0, len(addresses), multicall_batch)]
+
+    def aggregate(batch):
+        # (target, allowFailure, callData) per address, calldata being balanceOf(address)
+        calls = ",".join(f"({token_address},true,{balance_of_calldata(address)})" for address in batch)
+        result = quiet_run_command(
+            ["cast", "call", multicall3, "aggregate3((address,bool,bytes)[])((bool,bytes)[])", f"[{calls}]"]
+        )
+        return MULTICALL_RESULT_RE.findall(result.stdout) if result.returncode == 0 else []
+
+    # The batches are independent calls that spend their time waiting on cast and the node,
+    # so they run side by side
+    with concurrent.futures.ThreadPoolExecutor(max_workers=multicall_workers) as executor:
+        aggregated = list(executor.map(aggregate, batches))
+
+    balances = {}
+    for batch, returned in zip(batches, aggregated):
+        if len(returned) != len(batch):
+            logger.debug("Multicall3 is not available, reading balances one at a time")
+            for address in batch:
+                balance = balance_of(token_address, address)
+                if balance is not None:
+                    balances[address] = balance
+            continue
+
+        for address, (success, data) in zip(batch, returned):
+            if success == "true" and len(data) > 2:
+                balances[address] = int(data, 16)
+    return balances
+
+
+def transfer_recipients(token_address, start_block, end_block):
+    """
+    Get the recipient addresses of a token's Transfer events in a range of blocks
+
+    Only the addresses are kept: the decoded logs, which can run to many MB for a busy token,
+    are released before the recipients are probed.
+
+    Returns:
+        set: the distinct lowercase recipient addresses, or None if the logs could not be fetched
+    """
+    events = quiet_rpc(
+        "eth_getLogs",
+        {
+            "fromBlock": to_hex(start_block),
+            "toBlock": to_hex(end_block),
+            "address": token_address,
+            "topics": [transfer_topic],
+        },
+    )
+    if "error" in events:
+        logger.debug(f"Failed to get Transfer events: {events['error']}")
+        return None
+    logs = events.get("result") or []
+    logger.debug(f"Found {len(logs)} Transfer events")
+
+    # Process each event
+    recipients = set()
+    for log in logs:
+        # Standard ERC20 Transfer event has:
+        # topics[0]: Event signature
+        # topics[1]: From address (indexed)
+        # topics[2]: To address (indexed)
+        # data: Amount (not indexed)
+        topics = log.get("topics", [])
+        if len(topics) >= 3:
+            # Extract 'to' address from topics[2]
+            # Topic values are 32 bytes (64 hex chars + 0x), but addresses are 20 bytes (40 hex chars)
+            padded_to_address = topics[2]
+            # Take the last 40 characters (20 bytes) to get the address
+            to_address = "0x" + padded_to_address[-40:]
+            recipients.add(to_address.lower())
+    return recipients
+
+
 def grab_erc20(network, wallet, eth_amount, token):
     """
     Get ERC20 tokens for a wallet by impersonating holders from the event logs
@@ -474,132 +779,83 @@ def grab_erc20(network, wallet, eth_amount, token):
     token_address = address_of(network, token)
 
     # Check current balance
-    wei_balance = (
-        run_command(["cast", "call", token_address, "balanceOf(address)(uint256)", wallet_address])
-        .stdout.strip()
-        .split()[0]
-    )
-    eth_balance = run_command(["cast", "from-wei", wei_balance]).stdout.strip()
+    wei_balance = balance_of(token_address, wallet_address)
+    if wei_balance is None:
+        print(f"*** Error: could not read the {token} balance of {wallet}")
+        sys.exit(1)
+    eth_balance = from_wei(wei_balance)
     print(f"*** giving {wallet} {eth_amount} erc20 {token} (current: {eth_balance})...")
 
     # Convert to wei
-    wei_amount = int(run_command(["cast", "to-wei", eth_amount]).stdout.strip())
+    wei_amount = to_wei(eth_amount)
 
     # Track progress
     wei_amount_transferred = 0
-    done = [wallet_address.lower()]  # Use lowercase for consistent comparison
+    # Use lowercase for consistent comparison; the zero address is never a holder to take from
+    done = {wallet_address.lower(), zero_address}
 
     # Start with recent blocks
-    latest_block = int(run_command(["cast", "block", "latest", "-f", "number"]).stdout.strip())
-    block_window = 2000
-    blocks_to_check = [(latest_block - block_window, latest_block)]
-
-    # Process blocks until we have enough tokens or run out of blocks
-    while blocks_to_check and wei_amount_transferred < wei_amount:
-        start_block, end_block = blocks_to_check.pop(0)
-        if start_block < 0:
-            start_block = 0
-
-        # Get Transfer events using JSON output for easier parsing
+    latest_block = int(rpc("eth_blockNumber"), 16)
+    min_block_window = 2000
+    max_block_window = 64000
+    block_window = min_block_window
+
+    # Process windows of blocks, each ending just before the last one started, until we have
+    # enough tokens (returning early) or run out of blocks
+    end_block = latest_block
+    while end_block >= 0:
+        start_block = max(0, end_block - block_window)
+
+        # Get the recipients of Transfer events
         logger.debug(f"Checking blocks {start_block} to {end_block}")
-        events = quiet_run_command(
-            [
-                "cast",
-                "logs",
-                "--from-block",
-                str(start_block),
-                "--to-block",
-                str(end_block),
-                "--address",
-                token_address,
-                "Transfer(address,address,uint256)",
-                "--json",  # Request JSON output format
-            ]
-        )
+        recipients = transfer_recipients(token_address, start_block, end_block)
 
-        # Skip if error or no events
-        if events.returncode != 0 or not events.stdout.strip():
-            # Queue earlier blocks to check
-            if start_block > 0:
-                new_end = start_block - 1
-                new_start = max(0, new_end - block_window)
-                blocks_to_check.append((new_start, new_end))
+        if recipients is None:
+            if block_window > min_block_window:
+                # The node may limit the range of a log query, so retry with half the window and grow
+                # no further than that from now on
+                max_block_window = block_window = block_window // 2
+                continue
+            # The query failed even at the smallest window: skip these blocks, at the same window
+            end_block = start_block - 1
             continue
+        end_block = start_block - 1
 
-        # Parse JSON events
-        try:
-            import json
-
-            logs = json.loads(events.stdout)
-            logger.debug(f"Found {len(logs)} Transfer events")
-
-            # Process each event
-            recipients = []
-            for log in logs:
-                # Standard ERC20 Transfer event has:
-                # topics[0]: Event signature
-                # topics[1]: From address (indexed)
-                # topics[2]: To address (indexed)
-                # data: Amount (not indexed)
-                topics = log.get("topics", [])
-                if len(topics) >= 3:
-                    # Extract 'to' address from topics[2]
-                    # Topic values are 32 bytes (64 hex chars + 0x), but addresses are 20 bytes (40 hex chars)
-                    padded_to_address = topics[2]
-                    # Take the last 40 characters (20 bytes) to get the address
-                    to_address = "0x" + padded_to_address[-40:]
-                    recipients.append(to_address.lower())
-        except json.JSONDecodeError:
-            logger.debug("Failed to parse JSON output from cast logs")
-            # If we can't parse the JSON, just skip this block range and try another
-            if start_block > 0:
-                new_end = start_block - 1
-                new_start = max(0, new_end - block_window)
-                blocks_to_check.append((new_start, new_end))
+        # Skip if no events, doubling the window to get through a quiet stretch in fewer calls
+        if not recipients:
+            block_window = min(block_window * 2, max_block_window)
             continue
 
         logger.debug(f"Found {len(recipients)} potential token holders")
 
-        # Process each unique recipient
-        for to_address in set(recipients):
-            # Skip already processed or zero address
-            if to_address in done or to_address == "0x0000000000000000000000000000000000000000":
-                continue
-
-            done.append(to_address)
-            logger.debug(f"Checking balance of: {to_address}")
+        # Skip already processed or zero address
+        holders = list(recipients - done)
+        done.update(holders)
 
-            try:
-                # Get token balance of this address
-                balance_result = quiet_run_command(
-                    ["cast", "call", token_address, "balanceOf(address)(uint256)", to_address]
-                )
+        # Get all their token balances up front, in as few calls as possible
+        balances = balances_of(token_address, holders)
 
-                if balance_result.returncode != 0 or not balance_result.stdout.strip():
-                    continue
+        # Process each recipient whose balance could be read
+        for to_address in holders:
+            if to_address not in balances:
+                continue
 
-                wei_pawn_holding = int(balance_result.stdout.strip().split()[0])
+            wei_pawn_holding = balances[to_address]
+            logger.debug(f"Balance of {to_address}: {wei_pawn_holding}")
 
+            try:
                 # Only process addresses with meaningful balances
                 if wei_pawn_holding > 1000000:  # Small threshold to catch more token holders
                     # Calculate how much to take (90% of their balance, capped at what we still need)
                     wei_to_steal = min(wei_pawn_holding * 9 // 10, wei_amount - wei_amount_transferred)
-                    eth_to_steal = run_command(["cast", "from-wei", str(wei_to_steal)]).stdout.strip()
+                    eth_to_steal = from_wei(wei_to_steal)
 
                     print(f"*** stealing {eth_to_steal} of {token} from {to_address}...")
 
                     # Use the with_impersonation helper
                     def transfer_tokens(impersonated_address):
                         # Give the address some ETH to pay for gas
-                        run_command(
-                            [
-                                "cast",
-                                "rpc",
-                                "anvil_setBalance",
-                                to_address,
-                                run_command(["cast", "to-hex", "27542757796200000000"]).stdout.strip(),
-                            ]
-                        )
+                        rpc("anvil_setBalance", to_address, to_hex(27542757796200000000))
 
                         # Transfer tokens
                         run_command(
@@ -621,9 +877,7 @@ def grab_erc20(network, wallet, eth_amount, token):
 
                     # Update tracking variables
                     wei_amount_transferred += wei_to_steal
-                    eth_amount_transferred = run_command(
-                        ["cast", "from-wei", str(wei_amount_transferred)]
-                    ).stdout.strip()
+                    eth_amount_transferred = from_wei(wei_amount_transferred)
                     print(f"*** total amount stolen so far: {eth_amount_transferred} of {eth_amount}")
 
                     # Exit if we have enough
@@ -633,16 +887,10 @@ def grab_erc20(network, wallet, eth_amount, token):
             except Exception as e:
                 logger.debug(f"Error processing address {to_address}: {str(e)}")
 
-        # Queue up earlier blocks to check if we need more tokens
-        if wei_amount_transferred < wei_amount and start_block > 0:
-            new_end = start_block - 1
-            new_start = max(0, new_end - block_window)
-            blocks_to_check.append((new_start, new_end))
-
     # If we still couldn't find enough tokens
     if wei_amount_transferred < wei_amount:
         remaining = wei_amount - wei_amount_transferred
-        remaining_eth = run_command(["cast", "from-wei", str(remaining)]).stdout.strip()
+        remaining_eth = from_wei(remaining)
         print(f"*** Warning: Could only find {eth_amount_transferred} of requested {eth_amount} tokens")
         print(f"*** Missing {remaining_eth} tokens. Try checking more blocks or a different token.")
 
@@ -652,10 +900,15 @@ def start(network, chain_id=None):
     anvil_process = None
 
     def wait_for_anvil():
-        while quiet_run_command(["nc", "-z", "localhost", "8545"]).returncode != 0:
-            time.sleep(1)
+        # Poll anvil's port directly until it accepts a connection
+        while True:
+            try:
+                socket.create_connection(("localhost", 8545), timeout=0.2).close()
+                break
+            except OSError:
+                time.sleep(0.1)
         print("*** allowing baomultisig to be impersonated...")
-        run_command(["cast", "rpc", "anvil_impersonateAccount", bcinfo(network, "baomultisig")])
+        rpc("anvil_impersonateAccount", bcinfo(network, "baomultisig"))
         grab(network, "baomultisig", "1")
 
     def signal_handler(sig, frame):
@@ -740,12 +993,8 @@ def format_call_result(stdout, sig_input=None, network=None):
 
         # Integer types (uint*, int*)
         if output_type.startswith(("uint", "int")):
-            if result.startswith("0x"):
-                try:
-                    decimal_value = int(result, 16)
-                    return f"{decimal_value}"  # Just show decimal for ints
-                except ValueError:
-                    pass
+            if len(result) > 2 and HEX_RE.fullmatch(result):
+                return f"{int(result, 16)}"  # Just show decimal for ints
 
         # Boolean type
         elif output_type == "bool":
@@ -761,27 +1010,16 @@ def format_call_result(stdout, sig_input=None, network=None):
 
         # Bytes and string types
         elif output_type.startswith(("bytes", "string")):
-            # Try to decode if it looks like hex
-            if result.startswith("0x"):
-                try:
-                    # Try to decode as string if it's UTF-8 encodable
-                    bytes_value = bytes.fromhex(result[2:])
-                    string_value = bytes_value.decode("utf-8", errors="replace")
-                    if all(c.isprintable() or c.isspace() for c in string_value):
-                        return f'{result} (decoded: "{string_value}")'
-                except (ValueError, UnicodeDecodeError):
-                    pass
+            # Try to decode as a string if it's whole bytes of hex
+            if len(result) % 2 == 0 and HEX_RE.fullmatch(result):
+                string_value = bytes.fromhex(result[2:]).decode("utf-8", errors="replace")
+                if all(c.isprintable() or c.isspace() for c in string_value):
+                    return f'{result} (decoded: "{string_value}")'
 
     # Default formatting based on the output content
     if result.startswith("0x"):
-        try:
-            # Convert hex to decimal if it's a hex number
-            decimal_value = int(result, 16)
-            # Return both hex and decimal representation
-            return f"{decimal_value}"
-        except ValueError:
-            # If not a valid hex number, just return as is
-            return result
+        # Convert hex to decimal if it's a hex number, otherwise return it as is
+        return f"{int(result, 16)}" if len(result) > 2 and HEX_RE.fullmatch(result) else result
 
     # For array or structured output (multi-line)
     if "\n" in result:
@@ -791,65 +1029,27 @@ def format_call_result(stdout, sig_input=None, network=None):
     return result
 
 
-def main():
-    # Create the top-level parser with better help
-    parser = argparse.ArgumentParser(
-        description="Anvil script for interacting with Ethereum contracts",
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog="""
-Examples:
-  anvil.py start -f mainnet                             # Start anvil forked from mainnet
-  anvil.py start -f mainnet --chain-id 1                # Start anvil with specific chain ID
-  anvil.py steal --to me --amount 100                   # Add 100 ETH to your account
-  anvil.py steal --to me --amount 1 --erc20 wsteth      # Add 1 wstETH to your account
-  anvil.py grant --role MINTER_ROLE --on token --to me  # Grant role on contract
-  anvil.py sig ERC20.transfer                           # Show function signature
-        """,
-    )
-
-    # Add global arguments
-    parser.add_argument("-f", "--rpc-url", dest="network", default="mainnet", help="Network to fork from")
-    parser.add_argument("-v", action="count", default=0, help="Increase verbosity level")
-
-    # Create subparsers for commands
-    subparsers = parser.add_subparsers(dest="command", help="Command to execute")
-    subparsers.required = False  # Make subcommand optional, default to "start"
-
-    # Start command
+def add_start_parser(subparsers):
     start_parser = subparsers.add_parser("start", help="Start anvil instance")
     start_parser.add_argument("--chain-id", type=int, help="Specify chain ID for the anvil instance")
 
-    # Steal command and aliases
-    steal_aliases = [
-        "pinch",
-        "nick",
-        "grab",
-        "pilfer",
-        "embezzle",
-        "rob",
-        "swipe",
-        "thieve",
-        "filch",
-        "purloin",
-        "lift",
-        "pillage",
-        "plunder",
-        "loot",
-        "snatch",
-    ]
+
+def add_steal_parser(subparsers):
     steal_parser = subparsers.add_parser("steal", help="Add tokens to an address", aliases=steal_aliases)
     steal_parser.add_argument("--erc20", help="ERC20 token address or name (if omitted, steals ETH)")
     steal_parser.add_argument("--to", required=True, help="Recipient address")
     steal_parser.add_argument("--amount", required=True, help="Amount of tokens to transfee")
 
-    # Grant command
+
+def add_grant_parser(subparsers):
     grant_parser = subparsers.add_parser("grant", help="Grant a role on a contract")
     grant_parser.add_argument("--role", required=True, help="Role identifier/name")
     grant_parser.add_argument("--on", required=True, help="Contract address with role system")
     grant_parser.add_argument("--to", required=True, help="Address to receive the role")
     grant_parser.add_argument("--as", dest="as_", help="Address to impersonate when granting")
 
-    # Call command
+
+def add_call_parser(subparsers):
     call_parser = subparsers.add_parser("call", help="Read-only call to contract")
     call_parser.add_argument("--to", required=True, help="Contract address")
     call_parser.add_argument(
@@ -860,7 +1060,8 @@ Examples:
     call_parser.add_argument("--as", dest="as_", help="Address to impersonate for the call")
     call_parser.add_argument("args", nargs=argparse.REMAINDER, help="Arguments to pass to function")
 
-    # Send command
+
+def add_send_parser(subparsers):
     send_parser = subparsers.add_parser("send", help="State-changing transaction to contract")
     send_parser.add_argument("--to", required=True, help="Contract address")
     send_parser.add_argument(
@@ -871,15 +1072,135 @@ Examples:
     send_parser.add_argument("--as", dest="as_", help="Address to impersonate for the transaction")
     send_parser.add_argument("args", nargs=argparse.REMAINDER, help="Arguments to pass to function")
 
-    # Sig command
+
+def add_sig_parser(subparsers):
     sig_parser = subparsers.add_parser("sig", help="Look up function signature")
     sig_parser.add_argument(
         "signature",
         help="Either a function signature (e.g., 'transfer(address,uint256)') or Contract.function (e.g., 'ERC20.transfer')",
     )
 
+
+# Steal command aliases
+steal_aliases = [
+    "pinch",
+    "nick",
+    "grab",
+    "pilfer",
+    "embezzle",
+    "rob",
+    "swipe",
+    "thieve",
+    "filch",
+    "purloin",
+    "lift",
+    "pillage",
+    "plunder",
+    "loot",
+    "snatch",
+]
+steal_commands = frozenset(["steal", *steal_aliases])
+
+# Each command's subparser builder, in the order the help lists them
+subparser_builders = {
+    "start": add_start_parser,
+    "steal": add_steal_parser,
+    "grant": add_grant_parser,
+    "call": add_call_parser,
+    "send": add_send_parser,
+    "sig": add_sig_parser,
+}
+
+
+def build_parser(argv):
+    """
+    Build the argument parser for a command line
+
+    Only the subparser of the command being run is built; with no command on the line (e.g. for
+    the top-level --help) they all are.
+    """
+    # Global arguments, shared by the parser that finds the command and the full one
+    global_options = argparse.ArgumentParser(add_help=False)
+    global_options.add_argument("-f", "--rpc-url", dest="network", default="mainnet", help="Network to fork from")
+    global_options.add_argument("-v", action="count", default=0, help="Increase verbosity level")
+
+    # The command is the first positional argument, found the way the full parser will find it, so
+    # an option's value that happens to be a command name is not taken for the command
+    probe = argparse.ArgumentParser(parents=[global_options], add_help=False, exit_on_error=False)
+    probe.add_argument("command", nargs="?")
+    try:
+        command = probe.parse_known_args(argv)[0].command
+    except argparse.ArgumentError:
+        command = None  # left to the full parser to report
+
+    # Create the top-level parser with better help
+    parser = argparse.ArgumentParser(
+        parents=[global_options],
+        description="Anvil script for interacting with Ethereum contracts",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  anvil.py start -f mainnet                             # Start anvil forked from mainnet
+  anvil.py start -f mainnet --chain-id 1                # Start anvil with specific chain ID
+  anvil.py steal --to me --amount 100                   # Add 100 ETH to your account
+  anvil.py steal --to me --amount 1 --erc20 wsteth      # Add 1 wstETH to your account
+  anvil.py grant --role MINTER_ROLE --on token --to me  # Grant role on contract
+  anvil.py sig ERC20.transfer                           # Show function signature
+        """,
+    )
+
+    # Create subparsers for commands
+    subparsers = parser.add_subparsers(dest="command", help="Command to execute")
+    subparsers.required = False  # Make subcommand optional, default to "start"
+
+    if command not in subparser_builders and command not in steal_commands:
+        for add_parser in subparser_builders.values():
+            add_parser(subparsers)
+    else:
+        subparser_builders["steal" if command in steal_commands else command](subparsers)
+    return parser
+
+
+def show_signature(signature):
+    """
+    Print a Contract.function's signature with its input and return parameters
+    """
+    if "." in signature:
+        contract, func_name = signature.split(".", 1)
+        func_info = get_function_info(contract, func_name)
+
+        output = f'*** signature for {contract}.{func_name} is "{func_info["signature"]}"'
+
+        # Display input parameters if available
+        if func_info["inputs"]:
+            output += "\nInput Parameters:"
+            for i, param in enumerate(func_info["inputs"]):
+                name = param.get("name", "unnamed")
+                type_name = param.get("type", "")
+                output += f"\n  {i + 1}. {name}: {type_name}"
+
+        # Display return parameters if available
+        if func_info["outputs"]:
+            output += "\nReturn Values:"
+            for i, param in enumerate(func_info["outputs"]):
+                name = param.get("name", f"return_{i}")
+                type_name = param.get("type", "")
+                output += f"\n  {i + 1}. {name}: {type_name}"
+
+        print(output)
+    else:
+        print("*** error: When using a raw function signature, you must use the Contract.function format")
+        sys.exit(1)
+
+
+def main():
+    # A plain signature lookup needs neither argparse nor any of the setup below
+    if len(sys.argv) == 3 and sys.argv[1] == "sig" and not sys.argv[2].startswith("-"):
+        show_signature(sys.argv[2])
+        return
+
     # Parse arguments
-    args = parser.parse_args()
+    args = build_parser(sys.argv[1:]).parse_args()
 
     # Set the default command if none provided
     if not args.command:
@@ -894,7 +1215,7 @@ Examples:
     logger.info(f"Processing command: {args.command}")
 
     # Execute commands
-    if args.command in ["steal"] + steal_aliases:
+    if args.command in steal_commands:
         if args.erc20:
             print(f"*** transfer {args.to} {args.amount} ERC20 {args.erc20}")
             grab_erc20(args.network, args.to, args.amount, args.erc20)
@@ -903,8 +1224,9 @@ Examples:
             grab(args.network, args.to, args.amount)
 
     elif args.command == "grant":
-        on_address = address_of(args.network, args.on)
-        to_address = address_of(args.network, args.to)
+        on_address, to_address, *as_addresses = address_of_many(
+            args.network, [args.on, args.to] + ([args.as_] if args.as_ else [])
+        )
         role_number = role_number_of(args.network, args.role, on_address)
         print(f"*** grant role {args.role} on {args.on} to {args.to} as {args.as_}...")
 
@@ -912,8 +1234,7 @@ Examples:
         auth_flags = []
         if args.as_:
             # When impersonating, we need to use --unlocked
-            as_address = address_of(args.network, args.as_)
-            auth_flags = ["--from", as_address, "--unlocked"]
+            auth_flags = ["--from", as_addresses[0], "--unlocked"]
         else:
             # When not impersonating, try to use the private key from env var
             pk = os.getenv("PRIVATE_KEY")
@@ -928,28 +1249,33 @@ Examples:
         run_command(["cast", "send", on_address, "grantRoles(address,uint256)", to_address, role_number] + auth_flags)
 
     elif args.command in ["call", "send"]:
-        to_address = address_of(args.network, args.to)
+        is_send = args.command == "send"
+
+        # Parse the signature
+        sig, param_types = parse_sig(args.network, args.sig)
+
+        # Find the arguments that correspond to an address type, from the signature's parameters
+        # (only as many as there are arguments)
+        address_args = [i for i, param_type in enumerate(param_types[: len(args.args)]) if "address" in param_type]
+
+        # Resolve the contract, the impersonated address and the address arguments together
+        addresses = address_of_many(
+            args.network,
+            [args.to] + ([args.as_] if args.as_ else []) + [args.args[i] for i in address_args],
+        )
+        to_address = addresses.pop(0)
         to = f"{args.to} ({to_address})" if to_address != args.to else args.to
         if args.as_:
-            as_address = address_of(args.network, args.as_)
+            as_address = addresses.pop(0)
             as_ = " as " + args.as_ + " (" + as_address + ")" if as_address != args.as_ else ""
         else:
             as_address = None
             as_ = ""
-        # Parse the signature
-        sig, param_types = parse_sig(args.network, args.sig)
-
-        # Apply address_of to any argument that corresponds to an address type
-        processed_args = []
-        for i, arg in enumerate(args.args):
-            # Check if this parameter is an address type
-            is_address = i < len(param_types) and "address" in param_types[i]
 
-            if is_address:
-                # Convert the argument to an address
-                processed_args.append(address_of(args.network, arg))
-            else:
-                processed_args.append(arg)
+        # Convert the address arguments to addresses
+        processed_args = list(args.args)
+        for i, address in zip(address_args, addresses):
+            processed_args[i] = address
 
         print(f"*** {args.command} to {to} with signature {sig}{as_}...")
         if processed_args != args.args:
@@ -957,7 +1283,7 @@ Examples:
 
         # Prepare auth flags for send command
         auth_flags = []
-        if args.command == "send":
+        if is_send:
             # For 'send', we need to specify how the transaction will be signed
             if as_address:
                 # When impersonating, we need to use --unlocked
@@ -979,13 +1305,13 @@ Examples:
             lambda as_address: run_command(
                 ["cast", args.command, to_address, sig]
                 + processed_args
-                + (auth_flags if args.command == "send" else [])
+                + auth_flags
                 + ([verbosity] if verbosity else [])
             ),
         )
 
         # For 'call' operations, show the result
-        if args.command == "call" and result.stdout:
+        if not is_send and result.stdout:
             formatted_result = format_call_result(result.stdout, args.sig, args.network)
             print(f"Result: {formatted_result}")
 
@@ -993,33 +1319,7 @@ Examples:
         start(args.network, args.chain_id)
 
     elif args.command == "sig":
-        # Parse the signature format using the same parser as call/send
-        if "." in args.signature:
-            contract, func_name = args.signature.split(".", 1)
-            func_info = get_function_info(contract, func_name)
-
-            output = f'*** signature for {contract}.{func_name} is "{func_info["signature"]}"'
-
-            # Display input parameters if available
-            if func_info["inputs"]:
-                output += "\nInput Parameters:"
-                for i, param in enumerate(func_info["inputs"]):
-                    name = param.get("name", "unnamed")
-                    type_name = param.get("type", "")
-                    output += f"\n  {i + 1}. {name}: {type_name}"
-
-            # Display return parameters if available
-            if func_info["outputs"]:
-                output += "\nReturn Values:"
-                for i, param in enumerate(func_info["outputs"]):
-                    name = param.get("name", f"return_{i}")
-                    type_name = param.get("type", "")
-                    output += f"\n  {i + 1}. {name}: {type_name}"
-
-            print(output)
-        else:
-            print("*** error: When using a raw function signature, you must use the Contract.function format")
-            sys.exit(1)
+        show_signature(args.signature)
 
 
 if __name__ == "__main__":
@@ -45,6 +45,7 @@ import os
 import re
 import sys
 from collections import OrderedDict
+from pathlib import Path
 
 # Make sibling bin modules importable (matches the other bin scripts).
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
@@ -53,6 +54,8 @@ import forge_tables  # noqa: E402
 import pandas as pd  # noqa: E402
 
 HEADER_RE = re.compile(r"^#\s*regression:\s*(.*)$", re.MULTILINE)
+# A first cell made only of these is a table's separator row (`|---|`, `|:--|`).
+SEPARATOR_CHARS = frozenset("-: ")
 # `parse_tables` treats a first cell of "function name" as a heading, so the table round-trips.
 GAS_COLUMNS = ("function name", "max", "display")
 
@@ -73,16 +76,23 @@ def parse_tables(text):
             current = s  # a section / contract path line, e.g. src/X.sol:X
             tables.setdefault(current, OrderedDict())
             continue
-        cells = [c.strip() for c in s.strip("|").split("|")]
+        # Only the name and value cells are read, so split off just those two.
+        cells = s.strip("|").split("|", 2)
         if len(cells) < 2:
             continue
-        name = cells[0]
-        if name.lower() in ("function name", "contract", "file", "name") or set(name) <= set("-: "):
+        name = cells[0].strip()
+        if name.lower() in ("function name", "contract", "file", "name") or set(name) <= SEPARATOR_CHARS:
             continue  # header / separator row
-        try:
-            value = float(cells[1])
-        except ValueError:
-            continue
+        # Values are plain integers in the current format, so read those exactly and leave float()
+        # for the scientific notation of the old one.
+        cell = cells[1].strip()
+        if cell.isdecimal():
+            value = int(cell)
+        else:
+            try:
+                value = float(cell)
+            except ValueError:
+                continue
         if current is None:
             current = "(unknown)"
             tables.setdefault(current, OrderedDict())
@@ -96,13 +106,11 @@ def merge(committed, fresh, cfg):
     abs_tol, rel_tol = cfg["abs"], cfg["rel"]
     merged = OrderedDict()
     changes = []  # (path, name, kind, old, new)
-    seen = set()
 
     for path, rows in fresh.items():
         committed_rows = committed.get(path, {})
         out = OrderedDict()
         for name, new in rows.items():
-            seen.add((path, name))
             old = committed_rows.get(name)
             if old is None:
                 out[name] = new
@@ -127,9 +135,12 @@ def merge(committed, fresh, cfg):
                 changes.append((path, name, "improved" if improved else "regressed", old, new))
         merged[path] = out
 
+    # A committed row is removed when its path's fresh table lacks it; the fresh tables are
+    # already keyed by name, so that is a dict lookup rather than a separate seen-set.
     for path, rows in committed.items():
+        fresh_rows = fresh.get(path, {})
         for name, old in rows.items():
-            if (path, name) not in seen:
+            if name not in fresh_rows:
                 changes.append((path, name, "removed", old, None))
     return merged, changes
 
@@ -213,7 +224,8 @@ def read_pair(description):
     parser.add_argument("committed", help="committed baseline file")
     parser.add_argument("fresh", help="freshly extracted file")
     args = parser.parse_args()
-    return open(args.committed).read(), open(args.fresh).read()
+    # Decoded as UTF-8 whatever the locale, as the extract scripts write them.
+    return tuple(Path(path).read_bytes().decode("utf-8") for path in (args.committed, args.fresh))
 
 
 def main(policy, description):
@@ -199,8 +199,10 @@ def remapping_problems(foundry_remappings: list[str], wake_remappings: list[str]
     if normalized_foundry == wake_remappings:
         return []
 
-    foundry_only = [item for item in normalized_foundry if item not in wake_remappings]
-    wake_only = [item for item in wake_remappings if item not in normalized_foundry]
+    # membership against sets keeps the two one-sided lists linear in the lists' lengths
+    foundry_set, wake_set = set(normalized_foundry), set(wake_remappings)
+    foundry_only = [item for item in normalized_foundry if item not in wake_set]
+    wake_only = [item for item in wake_remappings if item not in foundry_set]
 
     # A wake entry that still carries foundry's context syntax (`context:prefix=target`) is the common
     # mistake (copying foundry's remapping verbatim): Wake doesn't support contexts, so it needs the
@@ -5,6 +5,30 @@ import re
 import forge_tables
 import pandas as pd
 
+HEADER_RE = re.compile(
+    r"^\| File\s+\| % Lines\s+\| % Statements\s+\| % Branches\s+\| % Funcs\s+\|$",
+    re.MULTILINE,
+)
+# the rows to keep start with a source path or are the Total
+FIRST_CELL = r"(?:(?:src|script)/|Total\b)" + forge_tables.ANY_CELL
+PERCENT_RE = re.compile(r"(\d+(?:\.\d+)?)%")
+COUNT_RE = re.compile(r"\((\d+/\d+)\)")
+
+
+def _format_coverage_column(cells: pd.Series) -> pd.Series:
+    """Format a whole column of "87% (118/136)" cells as "X  87% (118/136)" / "✓ 100% (27/27)".
+
+    Works on the column with pandas string ops rather than a Python call per cell. A cell with no
+    percentage is passed through stripped; a missing "(nn/mm)" count just drops the suffix.
+    """
+    cells = cells.str.strip()
+    percent = cells.str.extract(PERCENT_RE, expand=False).astype(float).round()
+    # the marker follows the ROUNDED figure, so 99.6% reads as a full "✓ 100%"
+    marker = pd.Series("X  ", index=cells.index).mask(percent == 100, "✓ ")
+    suffix = (" (" + cells.str.extract(COUNT_RE, expand=False) + ")").fillna("")
+    formatted = marker + percent.astype("Int64").astype(str).str.rjust(2) + "%" + suffix
+    return formatted.where(percent.notna(), cells)
+
 
 def toNamedDataFrame(input_data: str) -> tuple[pd.DataFrame, str] | None:
     """
@@ -17,26 +41,21 @@ def toNamedDataFrame(input_data: str) -> tuple[pd.DataFrame, str] | None:
     coverage summary's own columns - a bare "| File |" header is not enough.
     """
     # Extract the header line - must be the coverage summary's exact columns
-    header_match = re.search(
-        r"^\| File\s+\| % Lines\s+\| % Statements\s+\| % Branches\s+\| % Funcs\s+\|$",
-        input_data,
-        re.MULTILINE,
-    )
+    header_match = HEADER_RE.search(input_data)
     if not header_match:
         return None
     header_line = header_match.group(0)
-    header = [col.strip() for col in re.split(r"\s+\|\s+", header_line.strip("| "))]
+    # the match starts and ends on a bar: slice them off
+    header = [col.strip() for col in header_line[1:-1].split("|")]
 
-    # Extract rows containing 'src/' and clean them
-    rows_match = re.findall(r"^\| (?:(?:src|script)/|Total\b).+\|$", input_data, re.MULTILINE)
+    # Extract rows containing 'src/' and clean them, split into their cells by the same match
+    cells = (FIRST_CELL,) + (forge_tables.ANY_CELL,) * (len(header) - 1)
+    rows_match = forge_tables.tableRows(input_data, cells, (True,) * len(header))
     if not rows_match:
         raise ValueError("Input data does not contain valid table rows.")
 
-    data: list[list[str]] = []
-    for row_line in rows_match:
-        # Split by '|' separator and strip whitespace from each cell
-        columns = [col.strip() for col in re.split(r"\s+\|\s+", row_line.strip("| "))]
-
+    data: list[tuple[str, ...]] = []
+    for columns in rows_match:
         # Ignore Foundry script stubs (*.s.sol) to keep focus on deployable code coverage
         if columns and columns[0].endswith(".s.sol"):
             continue
@@ -52,32 +71,11 @@ def toNamedDataFrame(input_data: str) -> tuple[pd.DataFrame, str] | None:
         data.append(columns)
 
     # Create the DataFrame using the cleaned and validated data
-    df = pd.DataFrame(data, columns=header)
+    df = forge_tables.toDataFrame(data, header)
 
     # format the data to show xxx% (nn/mm), with asterisk and padding for <100%
-    def _format_coverage_cell(raw: str) -> str:
-        raw = raw.strip()
-        match = re.search(r"(\d+(?:\.\d+)?)%", raw)
-        if not match:
-            return raw
-
-        percent_value = float(match.group(1))
-        percent = f"{percent_value:2.0f}"
-
-        if percent == "100":
-            marker = "✓"
-            spacer = " "
-        else:
-            marker = "X"
-            spacer = "  "
-
-        count_match = re.search(r"\((\d+/\d+)\)", raw)
-        suffix = f" {count_match.group(0)}" if count_match else ""
-
-        return f"{marker}{spacer}{percent}%{suffix}"
-
     for column in df.columns[1:5]:
-        df[column] = df[column].map(_format_coverage_cell)
+        df[column] = _format_coverage_column(df[column])
 
     # Create a pandas DataFrame
     return df, ""
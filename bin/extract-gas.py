@@ -18,6 +18,15 @@ EXCLUDE_SUFFIXES = [
 ]
 
 
+PATH_RE = re.compile(r"^\|\s*(\S+):(\S+)\s+Contract\b", re.MULTILINE)
+HEADER_RE = re.compile(r"^\| Function Name\s+\|.+\|$", re.MULTILINE)
+# Function names may include full signatures for overloads: e.g. mintPeggedToken(uint256,address,uint256)
+FUNCTION_CELL = r"[A-Za-z$_][A-Za-z0-9$_]*(?:\([A-Za-z0-9,_ ]*\))?"
+
+# Only the max is regressed; the other forge columns are dropped as each row is parsed
+DROPPED_COLUMNS = ("min", "avg", "median", "# calls")
+
+
 def should_include(file_path: str) -> bool:
     """Check if a file path should be included in the gas report."""
     # First check if it matches an include path
@@ -39,7 +48,7 @@ def toNamedDataFrame(input_data: str) -> tuple[pd.DataFrame, str] | None:
     # forge interleaves other bordered tables in the same stream (e.g. the
     # invariant-test call summary "| Contract | Selector | Calls | ... |"), which
     # carry no file:contract header - those are not gas tables, so skip them.
-    path_match = re.search(r"^\|\s*(\S+):(\S+)\s+Contract\b", input_data, re.MULTILINE)
+    path_match = PATH_RE.search(input_data)
     if not path_match:
         return None
 
@@ -50,27 +59,23 @@ def toNamedDataFrame(input_data: str) -> tuple[pd.DataFrame, str] | None:
     if not should_include(file):
         return None
 
-    header_match = re.search(r"^\| Function Name\s+\|.+\|$", input_data, re.MULTILINE)
+    header_match = HEADER_RE.search(input_data)
     if not header_match:
         raise ValueError("Input data does not contain a valid table header.")
     header_line = header_match.group(0)
-    header = [col.strip().lower() for col in re.split(r"\s+\|\s+", header_line.strip("| "))]
+    # HEADER_RE anchors the line on its outer bars, so they are sliced off rather than stripped
+    header = [col.strip().lower() for col in header_line[1:-1].split("|")]
 
-    # Extract rows containing 'src/' and clean them
-    # Function names may include full signatures for overloads: e.g. mintPeggedToken(uint256,address,uint256)
+    # Extract the function rows, split into their kept cells by the same match
     # Exclude header row ("Function Name") by requiring no space before any '(' or end of name
-    rows_match = re.findall(r"^\| [A-Za-z$_][A-Za-z0-9$_]*(?:\([A-Za-z0-9,_ ]*\))?\s+\|.+\|$", input_data, re.MULTILINE)
-    if not rows_match:
+    keep = tuple(name not in DROPPED_COLUMNS for name in header)
+    cells = (FUNCTION_CELL,) + (forge_tables.ANY_CELL,) * (len(header) - 1)
+    data = forge_tables.tableRows(input_data, cells, keep)
+    if not data:
         raise ValueError("Input data does not contain valid table rows.")
 
-    data: list[list[str]] = []
-    for row_line in rows_match:
-        # Split by '|' separator and strip whitespace from each cell
-        columns = [col.strip() for col in re.split(r"\s+\|\s+", row_line.strip("| "))]
-        data.append(columns)
-
     # Create the DataFrame using the cleaned and validated data
-    df = pd.DataFrame(data, columns=header).drop(columns=["min", "avg", "median", "# calls"])
+    df = forge_tables.toDataFrame(data, [name for name, kept in zip(header, keep) if kept])
     # Emit the exact integer max; the merge (compare-gas.py) does tolerance/ratchet and renders the
     # friendly display column, so the extract must stay precise (an abs tolerance needs the real value).
     df["max"] = df["max"].astype(float).round().astype("int64")
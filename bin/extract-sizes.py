@@ -1,7 +1,10 @@
 #!/usr/bin/env python3
 # pyright: reportMissingImports=false
+import functools
 import json
+import os
 import re
+from collections.abc import Iterator
 from pathlib import Path
 
 import forge_tables
@@ -11,21 +14,48 @@ GAS_PER_BYTE = 200
 INITCODE_AVG_GAS_PER_BYTE = 10  # Half of the init bytes are assumed zero (4 gas) and half non-zero (16 gas).
 USD_PER_GAS = 0.10 / 1_000  # $0.10 per 1k gas
 
+HEADER_RE = re.compile(r"^\| Contract\s+\|.+\|$", re.MULTILINE)
+# a contract row: a contract name, then a runtime size
+CONTRACT_CELL = r"[A-Za-z0-9$_]+"
+SIZE_CELL = r"[0-9]" + forge_tables.ANY_CELL
 
-def get_contract_source_path(contract_name: str) -> str | None:
-    """Look up source path from compiled artifact metadata."""
-    out_dir = Path("out")
+# Forge reports the initcode margin, but nothing downstream uses it, so it is dropped as rows are parsed
+DROPPED_COLUMNS = ("Initcode Margin (B)",)
+
+
+def _sol_artifacts(directory: str) -> Iterator[os.DirEntry[str]]:
+    """Yield the JSON files in every *.sol directory under `directory`."""
+    # A plain scandir walk: it descends only into directories, and reads each *.sol directory's
+    # entries by name without matching a glob pattern against every path
+    for entry in os.scandir(directory):
+        if entry.is_dir(follow_symlinks=False):
+            if entry.name.endswith(".sol"):
+                yield from (artifact for artifact in os.scandir(entry.path) if artifact.name.endswith(".json"))
+            else:
+                yield from _sol_artifacts(entry.path)
+
+
+@functools.cache
+def artifact_index() -> dict[str, Path]:
+    """Map each contract name to its compiled artifact, from one walk of out/."""
     # Artifact is at out/**/{SourceFile}.sol/{ContractName}.json
     # The directory name is the source file (may differ from contract name),
     # but the JSON file is always named after the contract.
-    pattern = f"**/*.sol/{contract_name}.json"
-    matches = list(out_dir.glob(pattern))
-    if not matches:
+    index: dict[str, Path] = {}
+    if os.path.isdir("out"):
+        for artifact in _sol_artifacts("out"):
+            index.setdefault(artifact.name.removesuffix(".json"), Path(artifact.path))
+    return index
+
+
+@functools.cache
+def get_contract_source_path(contract_name: str) -> str | None:
+    """Look up source path from compiled artifact metadata."""
+    artifact_path = artifact_index().get(contract_name)
+    if artifact_path is None:
         return None
-    artifact_path = matches[0]
     try:
-        with open(artifact_path) as f:
-            artifact = json.load(f)
+        artifact = json.loads(artifact_path.read_bytes())
         targets = artifact.get("metadata", {}).get("settings", {}).get("compilationTarget", {})
         if targets:
             return next(iter(targets.keys()))
@@ -57,41 +87,33 @@ def toNamedDataFrame(input_data: str) -> tuple[pd.DataFrame, str]:
     Parse the table from the input data.
     """
     # Extract the header line
-    header_match = re.search(r"^\| Contract\s+\|.+\|$", input_data, re.MULTILINE)
+    header_match = HEADER_RE.search(input_data)
     if not header_match:
         raise ValueError("Input data does not contain a valid table header.")
     header_line = header_match.group(0)
-    header = [col.strip() for col in re.split(r"\s*\|\s*", header_line.strip("| "))]
+    header = [col.strip() for col in header_line[1:-1].split("|")]
 
-    # Extract rows containing 'src/' and clean them
-    rows_match = re.findall(r"^\|\s*[A-Za-z0-9$_]+\s*\|\s*[0-9]+.+\|$", input_data, re.MULTILINE)
-    if not rows_match:
+    # Extract the contract rows, split into their kept cells by the same match
+    keep = tuple(name not in DROPPED_COLUMNS for name in header)
+    cells = (CONTRACT_CELL, SIZE_CELL) + (forge_tables.ANY_CELL,) * (len(header) - 2)
+    data = forge_tables.tableRows(input_data, cells, keep)
+    if not data:
         raise ValueError("Input data does not contain valid table rows.")
 
-    data: list[list[str]] = []
-    for row_line in rows_match:
-        # Split by '|' separator and strip whitespace from each cell
-        columns = [col.strip() for col in re.split(r"\s+\|\s+", row_line.strip("| "))]
-        data.append(columns)
-
     # Create the DataFrame using the cleaned and validated data
-    df = pd.DataFrame(data, columns=header)
+    df = forge_tables.toDataFrame(data, [name for name, kept in zip(header, keep) if kept])
 
     # Filter out contracts from non-deployable directories
     df = df[~df["Contract"].apply(is_excluded_contract)]
 
-    df["Runtime Size (B)"] = [int(value.replace(",", "")) for value in df["Runtime Size (B)"]]
-    df["Runtime Margin (B)"] = [int(value.replace(",", "")) for value in df["Runtime Margin (B)"]]
-    df["Initcode Size (B)"] = [int(value.replace(",", "")) for value in df["Initcode Size (B)"]]
-
-    if "Initcode Margin (B)" in df.columns:
-        df = df.drop(columns=["Initcode Margin (B)"])
+    for column in ("Runtime Size (B)", "Runtime Margin (B)", "Initcode Size (B)"):
+        df[column] = df[column].str.replace(",", "", regex=False).astype(int)
 
     # columns_to_format = ["Runtime Size (B)"]
     # df[columns_to_format] = df[columns_to_format].map(lambda x: f"{x:>8}")
 
     deploy_gas = df["Runtime Size (B)"] * GAS_PER_BYTE + df["Initcode Size (B)"] * INITCODE_AVG_GAS_PER_BYTE
-    df["Deploy Gas"] = [int(value) for value in deploy_gas]
+    df["Deploy Gas"] = deploy_gas.astype(int)
     df["Deploy Cost ($)"] = df["Deploy Gas"] * USD_PER_GAS
 
     ordered_columns = [
@@ -1,33 +1,96 @@
+import functools
 import io
 import re
 import sys
+from collections.abc import Iterable, Iterator, Sequence
 from typing import Any, Callable, cast
 
 import pandas as pd
 from tabulate import tabulate
 
+# a separator line is made only of these, and starts and ends on a bar or corner
+BORDER_CHARS = " -+|="
 
-def extract(log_data: str) -> list[str]:
-    # extract a block of text that matches a table
-    result = []
-    in_group = False
-    for line in log_data.splitlines():
-        if re.match(r"^[|+][-  +|=]+[|+]$", line):  # Ignore separator lines
+# a cell's content, stripped: the padding either side is taken up by the separators in rowPattern
+ANY_CELL = r"[^|\n]*?"
+
+
+def _isSeparator(line: str) -> bool:
+    # a plain character check: this runs on every line of the log, most of which are not tables
+    return len(line) >= 3 and line[0] in "|+" and line[-1] in "|+" and not line.strip(BORDER_CHARS)
+
+
+def _isRow(line: str) -> bool:
+    # a |...| line, tested as a separator is: most log lines fail on the first character
+    return len(line) >= 3 and line[0] == "|" and line[-1] == "|"
+
+
+def extractLines(lines: Iterable[str]) -> Iterator[str]:
+    # extract the blocks of lines that match a table, yielding each one as soon as a non-table line
+    # ends it, so only the table being collected is held rather than the whole log
+    # each group collects its lines and is joined once at the end, rather than growing a string per line
+    group: list[str] = []
+    for line in lines:
+        if _isSeparator(line):  # Ignore separator lines
             # print(f"reject={line}")
             continue
-        elif re.match(r"^[|].+[|]$", line):  # Match valid |...| lines
-            if not in_group:  # start a new group
-                # print(f"new   ={line}")
-                result.append(line)
-                in_group = True
-            else:  # append to existing group
-                # print(f"append={line}")
-                result[-1] += f"\n{line}"
-        else:  # break the group
+        elif _isRow(line):  # Match valid |...| lines
+            # print(f"append={line}")
+            group.append(line)
+        elif group:  # break the group
             # print(f"break ={line}")
-            in_group = False
+            yield "\n".join(group)
+            group = []
+    if group:
+        yield "\n".join(group)
+
+
+def extract(log_data: str) -> list[str]:
+    # extract a block of text that matches a table
+    return list(extractLines(log_data.splitlines()))
+
+
+@functools.cache
+def rowPattern(cells: tuple[str, ...], keep: tuple[bool, ...]) -> re.Pattern[str]:
+    # one regex that both finds a table's rows and splits them: `cells` holds a pattern per column,
+    # and each match's groups are the stripped cells whose `keep` entry is True (the rest are matched
+    # but not captured), so a row is walked once instead of being found and then split again
+    body = r"[ \t]*\|[ \t]*".join(
+        f"({cell})" if kept else f"(?:{cell})" for cell, kept in zip(cells, keep, strict=True)
+    )
+    return re.compile(rf"^\|[ \t]*{body}[ \t]*\|$", re.MULTILINE)
+
+
+@functools.cache
+def _leadPattern(cells: tuple[str, ...]) -> re.Pattern[str]:
+    # what makes a line one of the table's data rows, whatever its cell count: the leading cells
+    # that are not ANY_CELL, followed by at least one more cell
+    lead = cells[: max(i for i, cell in enumerate(cells) if cell != ANY_CELL) + 1]
+    body = r"[ \t]*\|[ \t]*".join(f"(?:{cell})" for cell in lead)
+    return re.compile(rf"^\|[ \t]*{body}[ \t]*\|.*\|$")
+
+
+def tableRows(table: str, cells: tuple[str, ...], keep: tuple[bool, ...]) -> list[tuple[str, ...]]:
+    # the kept cells of each of the table's data rows, matched by rowPattern; a line that looks like
+    # a data row but has a different number of cells from the header is an error, not skipped
+    pattern = rowPattern(cells, keep)
+    rows: list[tuple[str, ...]] = []
+    for line in table.splitlines():
+        match = pattern.match(line)
+        if match:
+            rows.append(match.groups())
+        elif _leadPattern(cells).match(line):
+            raise ValueError(f"Table row has {line.count('|') - 1} columns but the header has {len(cells)}: {line}")
+    return rows
+
 
-    return result
+def toDataFrame(rows: Sequence[Sequence[str]], header: list[str]) -> pd.DataFrame:
+    # build column-wise: pandas takes one list per column as-is, skipping the row-to-column
+    # transpose and per-row inference it does for a list of rows
+    columns = list(zip(*rows, strict=True)) if rows else [() for _ in header]
+    if len(columns) != len(header):
+        raise ValueError(f"Table rows have {len(columns)} columns but the header has {len(header)}.")
+    return pd.DataFrame({name: list(column) for name, column in zip(header, columns)}, dtype=object)
 
 
 def toStr(
@@ -54,21 +117,23 @@ def process(
     floatfmt: str | dict[str, str],
     intfmt: str,
 ):
-    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8")
-    first = True
-    for table in extract(sys.stdin.read()):
+    # stream the log a line at a time, so only the table being collected is held in memory rather
+    # than the whole log; forge writes UTF-8 (the table borders are not ASCII) whatever the locale
+    log_lines = io.TextIOWrapper(sys.stdin.buffer, encoding="utf-8")
+    # collect the whole output and write it once, as UTF-8 bytes, rather than a write per fragment
+    parts: list[str] = []
+    for table in extractLines(line.rstrip("\n") for line in log_lines):
         # Parse the table (may return None to skip)
         result = toNamedDataFrame(table)
         if result is None:
             continue
         parsed_df, path = result
 
-        # Write the formatted table to stdout
-        if first:
-            first = False
-        else:
-            sys.stdout.write("\n")
+        # Separate each formatted table from the one before
+        if parts:
+            parts.append("\n")
 
         if path:
-            sys.stdout.write(path + "\n")
-        sys.stdout.write(toStr(parsed_df, floatfmt=floatfmt, intfmt=intfmt) + "\n")
+            parts.append(path + "\n")
+        parts.append(toStr(parsed_df, floatfmt=floatfmt, intfmt=intfmt) + "\n")
+    sys.stdout.buffer.write("".join(parts).encode("utf-8"))
@@ -15,8 +15,9 @@ def main():
     # Default test path if none provided
     args = sys.argv[1:] or ["test"]
 
-    # Construct full paths for args that are directory/file paths
+    # Construct full paths for args that are directory/file paths, noting any verbosity flag on the way
     full_args = []
+    verbose = False
     for arg in args:
         # Only modify args that look like paths and don't start with '-'
         if not arg.startswith("-") and not any(c in arg for c in "=:"):
@@ -27,10 +28,11 @@ def main():
             else:
                 full_args.append(arg)
         else:
+            verbose = verbose or arg.startswith("-v")
             full_args.append(arg)
 
     # Add sensible defaults if not specified
-    if not any(arg.startswith("-v") for arg in full_args):
+    if not verbose:
         full_args.insert(0, "-v")
 
     print(f"Running pytest with args: {' '.join(full_args)}")
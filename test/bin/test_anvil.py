@@ -0,0 +1,150 @@
+import argparse
+import functools
+import importlib.util
+import pathlib
+
+import pytest
+
+
+@functools.cache
+def load_module():
+    module_path = pathlib.Path(__file__).resolve().parents[2] / "bin" / "archive" / "anvil.py"
+    spec = importlib.util.spec_from_file_location("anvil", module_path)
+    module = importlib.util.module_from_spec(spec)
+    assert spec.loader is not None
+    spec.loader.exec_module(module)  # type: ignore[attr-defined]
+    return module
+
+
+def word(value: int, signed: bool = False) -> str:
+    return value.to_bytes(32, "big", signed=signed).hex()
+
+
+def built_commands(parser: argparse.ArgumentParser) -> set[str]:
+    subparsers = next(action for action in parser._actions if isinstance(action, argparse._SubParsersAction))
+    return {subparser.prog.split()[-1] for subparser in subparsers.choices.values()}
+
+
+ADDRESS = "0x" + "ab" * 20
+
+
+@pytest.mark.parametrize(
+    "param_type, data, expected",
+    [
+        ("uint256", word(2**256 - 1), str(2**256 - 1)),
+        ("uint8", word(7), "7"),
+        ("int256", word(-5, signed=True), "-5"),
+        ("int8", word(5), "5"),
+        ("address", "00" * 12 + ADDRESS[2:], ADDRESS),
+        ("bool", word(1), "true"),
+        ("bool", word(0), "false"),
+        ("bytes4", "deadbeef" + "00" * 28, "0xdeadbeef"),
+        ("bytes32", "11" * 32, "0x" + "11" * 32),
+    ],
+)
+def test_decode_static_params_decodes_each_static_type(param_type, data, expected):
+    assert load_module().decode_static_params([param_type], data) == [expected]
+
+
+def test_decode_static_params_decodes_a_word_per_parameter():
+    module = load_module()
+    data = "0x" + "00" * 12 + ADDRESS[2:] + word(42) + word(1)
+    assert module.decode_static_params(["address", "uint256", "bool"], data) == [ADDRESS, "42", "true"]
+
+
+@pytest.mark.parametrize(
+    "param_types, data",
+    [
+        (["uint256"], word(1)[:-2]),  # a word one byte short
+        (["uint256", "uint256"], word(1)),  # a missing second word
+        (["string"], word(32) + word(0)),  # dynamic, left to cast
+        (["uint256[]"], word(32) + word(0)),
+        (["uint256"], "not hex"),
+    ],
+)
+def test_decode_static_params_returns_none_when_it_cannot_decode(param_types, data):
+    assert load_module().decode_static_params(param_types, data) is None
+
+
+def test_describe_error_names_the_decoded_parameters():
+    error = {
+        "type": "error",
+        "name": "Insufficient",
+        "inputs": [{"name": "who", "type": "address"}, {"name": "needed", "type": "uint256"}],
+    }
+    data = "0x12345678" + "00" * 12 + ADDRESS[2:] + word(10)
+    description, raw = load_module().describe_error("Token", error, data)
+    assert description == f"Error: Insufficient(who={ADDRESS}, needed=10) [from Token]"
+    assert raw == data
+
+
+@pytest.mark.parametrize(
+    "amount, wei",
+    [("1", 10**18), ("1.5", 15 * 10**17), ("0.000000000000000001", 1), ("0", 0), ("1e3", 10**21)],
+)
+def test_to_wei(amount, wei):
+    assert load_module().to_wei(amount) == wei
+
+
+@pytest.mark.parametrize("amount", ["0.0000000000000000001", "1.0000000000000000005", "abc", "inf", "nan"])
+def test_to_wei_rejects_amounts_that_are_not_whole_wei(amount, capsys):
+    with pytest.raises(SystemExit):
+        load_module().to_wei(amount)
+    assert f"invalid amount '{amount}'" in capsys.readouterr().out
+
+
+@pytest.mark.parametrize(
+    "wei, eth",
+    [
+        (10**18, "1.000000000000000000"),
+        (1, "0.000000000000000001"),
+        (0, "0.000000000000000000"),
+        (-1, "-0.000000000000000001"),
+        (-15 * 10**17, "-1.500000000000000000"),
+    ],
+)
+def test_from_wei(wei, eth):
+    assert load_module().from_wei(wei) == eth
+
+
+@pytest.mark.parametrize(
+    "argv, expected",
+    [
+        (["start", "--chain-id", "1"], {"command": "start", "chain_id": 1}),
+        (["-f", "sepolia", "start"], {"command": "start", "network": "sepolia"}),
+        (["steal", "--to", "me", "--amount", "1"], {"command": "steal", "to": "me", "amount": "1", "erc20": None}),
+        (["pinch", "--to", "me", "--amount", "1", "--erc20", "wsteth"], {"command": "pinch", "erc20": "wsteth"}),
+        (
+            ["grant", "--role", "MINTER_ROLE", "--on", "token", "--to", "me", "--as", "owner"],
+            {"command": "grant", "role": "MINTER_ROLE", "on": "token", "to": "me", "as_": "owner"},
+        ),
+        (
+            ["-vv", "call", "--to", "token", "--sig", "ERC20.balanceOf", "me"],
+            {"command": "call", "v": 2, "to": "token", "sig": "ERC20.balanceOf", "args": ["me"]},
+        ),
+        (
+            ["send", "--to", "token", "--sig", "ERC20.transfer", "--as", "me", "you", "1"],
+            {"command": "send", "as_": "me", "args": ["you", "1"]},
+        ),
+        (["sig", "ERC20.transfer"], {"command": "sig", "signature": "ERC20.transfer"}),
+        # an option's value that is also a command name is not the command
+        (["-f", "start", "steal", "--to", "me", "--amount", "1"], {"command": "steal", "network": "start"}),
+    ],
+)
+def test_each_command_parses_through_its_own_subparser(argv, expected):
+    module = load_module()
+    parser = module.build_parser(argv)
+    # only the running command's subparser is built (an alias's choices all lead to the steal one)
+    command = "steal" if expected["command"] in module.steal_commands else expected["command"]
+    assert built_commands(parser) == {command}
+
+    args = parser.parse_args(argv)
+    for name, value in expected.items():
+        assert getattr(args, name) == value
+
+
+def test_no_command_builds_every_subparser():
+    module = load_module()
+    parser = module.build_parser([])
+    assert built_commands(parser) == set(module.subparser_builders)
+    assert parser.parse_args([]).command is None
@@ -1,8 +1,10 @@
+import functools
 import importlib.util
 import pathlib
 import textwrap
 
 
+@functools.cache
 def load_module():
     module_path = pathlib.Path(__file__).resolve().parents[2] / "bin" / "extract-coverage.py"
     spec = importlib.util.spec_from_file_location("extract_coverage", module_path)
@@ -6,6 +6,7 @@ against the run total - the comparison (compare-duration.py) divides out a robus
 compare time, which is what keeps it machine-independent without coupling every suite to every other.
 """
 
+import functools
 import importlib.util
 import pathlib
 import textwrap
@@ -20,6 +21,7 @@ import pytest
 FLOAT_TOLERANCE = 1e-15
 
 
+@functools.cache
 def load_module():
     module_path = pathlib.Path(__file__).resolve().parents[2] / "bin" / "extract-duration.py"
     spec = importlib.util.spec_from_file_location("extract_duration", module_path)
@@ -1,8 +1,12 @@
+import functools
 import importlib.util
 import pathlib
 import textwrap
 
+import pytest
 
+
+@functools.cache
 def load_module():
     module_path = pathlib.Path(__file__).resolve().parents[2] / "bin" / "extract-gas.py"
     spec = importlib.util.spec_from_file_location("extract_gas", module_path)
@@ -108,6 +112,15 @@ def test_excluded_path_returns_none():
     assert result is None
 
 
+def test_contract_label_found_below_the_first_line():
+    """The file:contract label is searched for, so a table is still recognised when it is not the first row."""
+    module = load_module()
+    result = module.toNamedDataFrame("| Gas report |  |  |  |  |  |\n" + sample_table_basic())
+    assert result is not None
+    _, path = result
+    assert path == "src/minter/Minter_v3.sol:Minter_v3"
+
+
 def test_overloaded_function_signatures():
     module = load_module()
     result = module.toNamedDataFrame(sample_table_with_overloads())
@@ -133,6 +146,14 @@ def test_deployment_cost_rows_excluded():
     assert "Deployment Cost" not in df["function name"].values
 
 
+def test_row_with_a_different_cell_count_raises():
+    """A function row that does not split into the header's columns is an error, not silently dropped."""
+    module = load_module()
+    table = sample_table_basic() + "\n| burn | 1 | 2 | 3 | 4 |"
+    with pytest.raises(ValueError, match=r"Table row has 5 columns but the header has 6: \| burn "):
+        module.toNamedDataFrame(table)
+
+
 def sample_invariant_call_summary_table() -> str:
     """Invariant-test call summary table forge emits alongside gas tables.
 
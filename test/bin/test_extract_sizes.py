@@ -1,9 +1,11 @@
+import functools
 import importlib.util
 import pathlib
 
 import pandas as pd
 
 
+@functools.cache
 def load_module():
     module_path = pathlib.Path(__file__).resolve().parents[2] / "bin" / "extract-sizes.py"
     spec = importlib.util.spec_from_file_location("extract_sizes", module_path)
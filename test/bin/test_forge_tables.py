@@ -0,0 +1,121 @@
+"""Golden tests for forge_tables.toStr, the github-table renderer every regression file is written by.
+
+The output is pinned byte for byte, so a change in tabulate (or in how it is called) that would
+reformat the committed files shows up here rather than as churn in every consumer's regression
+files: the committed files must re-render unchanged, and frames of each column kind must render
+as pinned under each floatfmt/intfmt a caller passes.
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import forge_tables
+import pandas as pd
+import pytest
+
+ROOT = Path(__file__).resolve().parents[2]
+BIN = ROOT / "bin"
+REGRESSION = ROOT / "regression"
+
+# int, float, str and numeric-string columns in one frame, as the extract scripts build them
+MIXED = pd.DataFrame(
+    {
+        "name": ["mint", "burnFrom", "x"],
+        "calls": [7, 25271, 0],
+        "ratio": [0.5, 1234.5678, -2.0],
+        "figure": ["1.5", "20", "300.25"],
+    }
+)
+# every value numeric: the frame's values are numpy integers, which tabulate formats as floats
+INTS = pd.DataFrame({"min": [597, 13657], "max": [937, 15796]})
+
+
+@pytest.mark.parametrize(
+    "frame, floatfmt, intfmt, expected",
+    [
+        (
+            MIXED,
+            ".3e",
+            "",
+            """\
+| name     |   calls |      ratio |    figure |
+|----------|---------|------------|-----------|
+| mint     |       7 |  5.000e-01 | 1.500e+00 |
+| burnFrom |   25271 |  1.235e+03 | 2.000e+01 |
+| x        |       0 | -2.000e+00 | 3.002e+02 |""",
+        ),
+        (
+            MIXED,
+            ".3e",
+            ",",
+            """\
+| name     |   calls |      ratio |    figure |
+|----------|---------|------------|-----------|
+| mint     |       7 |  5.000e-01 | 1.500e+00 |
+| burnFrom |  25,271 |  1.235e+03 | 2.000e+01 |
+| x        |       0 | -2.000e+00 | 3.002e+02 |""",
+        ),
+        (
+            MIXED,
+            ".2f",
+            ",",
+            """\
+| name     |   calls |   ratio |   figure |
+|----------|---------|---------|----------|
+| mint     |       7 |    0.50 |     1.50 |
+| burnFrom |  25,271 | 1234.57 |    20.00 |
+| x        |       0 |   -2.00 |   300.25 |""",
+        ),
+        (
+            INTS,
+            ".3e",
+            "",
+            """\
+|       min |       max |
+|-----------|-----------|
+| 5.970e+02 | 9.370e+02 |
+| 1.366e+04 | 1.580e+04 |""",
+        ),
+        (
+            INTS,
+            ".3e",
+            ",",
+            """\
+|       min |       max |
+|-----------|-----------|
+| 5.970e+02 | 9.370e+02 |
+| 1.366e+04 | 1.580e+04 |""",
+        ),
+        (
+            INTS,
+            ".2f",
+            ",",
+            """\
+|      min |      max |
+|----------|----------|
+|   597.00 |   937.00 |
+| 13657.00 | 15796.00 |""",
+        ),
+    ],
+)
+def test_frame_renders_as_pinned(frame, floatfmt, intfmt, expected):
+    assert forge_tables.toStr(frame, floatfmt=floatfmt, intfmt=intfmt) == expected
+
+
+@pytest.mark.parametrize("kind", ["sizes", "coverage"])
+def test_committed_extract_output_rerenders_unchanged(kind):
+    # a committed extract file is itself a run of |...| rows, so extracting it again re-renders it
+    committed = (REGRESSION / f"{kind}.txt").read_bytes()
+    result = subprocess.run(
+        [sys.executable, str(BIN / f"extract-{kind}.py")], input=committed, capture_output=True, check=True
+    )
+    assert result.stdout == committed
+
+
+def test_committed_gas_file_rerenders_unchanged():
+    gas = REGRESSION / "gas.txt"
+    result = subprocess.run(
+        [sys.executable, str(BIN / "compare-gas.py"), str(gas), str(gas)], capture_output=True, check=True
+    )
+    assert result.stdout == gas.read_bytes()
@@ -18,7 +18,10 @@ writes a merged baseline, per (section, row), with:
 Exit 1 iff anything changed; only flagged rows differ from the committed baseline.
 """
 
+import contextlib
+import io
 import os
+import runpy
 import subprocess
 import sys
 import tempfile
@@ -80,6 +83,27 @@ def entry_script(policy: dict) -> str:
     )
 
 
+def run_script(script: Path, *args: str) -> tuple[int, str, str]:
+    """Run an entry script as `__main__` in this interpreter; return (returncode, stdout, stderr).
+
+    In-process rather than a subprocess, so pandas and the bin modules are imported once for the
+    session instead of once per run. argv, sys.path (which the entry script extends) and the standard
+    streams are restored afterwards; the subprocess path stays covered by `test_help_mentions_tolerance`.
+    """
+    stdout, stderr = io.StringIO(), io.StringIO()
+    saved_argv, saved_path = sys.argv, sys.path[:]
+    sys.argv = [str(script), *args]
+    try:
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+            runpy.run_path(str(script), run_name="__main__")
+        returncode = 0
+    except SystemExit as exit_:
+        returncode = exit_.code if isinstance(exit_.code, int) else int(exit_.code is not None)
+    finally:
+        sys.argv, sys.path[:] = saved_argv, saved_path
+    return returncode, stdout.getvalue(), stderr.getvalue()
+
+
 def run_merge(committed_text: str, fresh_text: str, policy: dict | None = None) -> tuple[int, dict[str, int], str, str]:
     """Run a compare entry point on two temp files; return (returncode, merged_values, stdout, stderr).
 
@@ -94,13 +118,8 @@ def run_merge(committed_text: str, fresh_text: str, policy: dict | None = None)
         else:
             script = base / "entry.py"
             script.write_text(entry_script(policy))
-        # Run under the same interpreter as the test so pandas/forge_tables (bin uv env) resolve.
-        result = subprocess.run(
-            [sys.executable, str(script), str(base / "committed.txt"), str(base / "fresh.txt")],
-            capture_output=True,
-            text=True,
-        )
-    return result.returncode, _merged_values(result.stdout), result.stdout, result.stderr
+        returncode, stdout, stderr = run_script(script, str(base / "committed.txt"), str(base / "fresh.txt"))
+    return returncode, _merged_values(stdout), stdout, stderr
 
 
 def run_mutated_module(module_text: str, committed_text: str, fresh_text: str) -> tuple[int, dict[str, int]]: